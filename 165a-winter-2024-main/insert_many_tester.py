@@ -0,0 +1,95 @@
+from lstore.db import Database
+from lstore.query import Query
+
+from random import randint, sample, seed
+
+db = Database()
+db.open('./ECS165_insert_many')
+# Create two tables with 5 columns, the same records go in one at a time and as batches
+single_table = db.create_table('Single', 5, 0)
+bulk_table = db.create_table('Bulk', 5, 0)
+
+single_query = Query(single_table)
+bulk_query = Query(bulk_table)
+
+# dictionary for records to test the database: test directory
+records = {}
+
+number_of_records = 2000  # Spans several page ranges of 512 records
+batch_size = 300
+number_of_aggregates = 100
+
+seed(3562901)
+
+for i in range(0, number_of_records):
+    key = 92106429 + i
+    records[key] = [key, randint(0, 20), randint(0, 20), randint(0, 20), randint(0, 20)]
+keys = sorted(list(records.keys()))
+
+for key in keys:
+    single_query.insert(*records[key])
+for start in range(0, number_of_records, batch_size):
+    if not bulk_query.insert_many([records[key] for key in keys[start: start + batch_size]]):
+        print('insert_many error on batch starting at', keys[start])
+if len(bulk_table.page_range) < 2:
+    print('insert_many error: expected more than one page range, got', len(bulk_table.page_range))
+print("Insert finished")
+
+# Check that both tables return the test directory's records and sums, and that their indexes agree
+def check_tables(single_query, bulk_query, label):
+    for key in keys:
+        single_record = single_query.select(key, 0, [1, 1, 1, 1, 1])[0]
+        bulk_record = bulk_query.select(key, 0, [1, 1, 1, 1, 1])[0]
+        if bulk_record.columns != records[key] or bulk_record.columns != single_record.columns:
+            print(label, 'select error on', key, ':', bulk_record, ', single insert:', single_record, ', correct:', records[key])
+
+    for i in range(0, number_of_aggregates):
+        r = sorted(sample(range(0, len(keys)), 2))
+        column_sum = sum(map(lambda key: records[key][1], keys[r[0]: r[1] + 1]))
+        single_result = single_query.sum(keys[r[0]], keys[r[1]], 1)
+        bulk_result = bulk_query.sum(keys[r[0]], keys[r[1]], 1)
+        if bulk_result != column_sum or single_result != column_sum:
+            print(label, 'sum error on [', keys[r[0]], ',', keys[r[1]], ']: ', bulk_result, ', single insert:', single_result, ', correct: ', column_sum)
+
+    # Both tables hand out the same RIDs in the same order, so their indexes must hold the same sets
+    single_index, bulk_index = single_query.table.index, bulk_query.table.index
+    if single_index.locate_range(keys[0], keys[-1], 0) != bulk_index.locate_range(keys[0], keys[-1], 0):
+        print(label, 'index error on the key range')
+    for key in keys:
+        if single_index.locate(0, key) != bulk_index.locate(0, key):
+            print(label, 'index error on', key, ':', bulk_index.locate(0, key), ', single insert:', single_index.locate(0, key))
+
+check_tables(single_query, bulk_query, 'insert')
+print("Select finished")
+
+# A batch with one bad record must be rejected whole, with nothing written
+next_key = keys[-1] + 1
+invalid_batches = [
+    [[next_key, 1, 2, 3, 4], [next_key + 1, 1, 2, 3]],  # Wrong number of columns
+    [[next_key, 1, 2, 3, 4], [next_key + 1, 1, 2, 3, 2 ** 63]],  # Does not fit a 64-bit slot
+]
+for batch in invalid_batches:
+    rid = bulk_table.rid
+    num_page_ranges = len(bulk_table.page_range)
+    num_base_records = bulk_table.page_range[bulk_table.page_range_index].num_base_records
+    if bulk_query.insert_many(batch) is not False:
+        print('insert_many error: invalid batch', batch, 'was accepted')
+    if (bulk_table.rid != rid or len(bulk_table.page_range) != num_page_ranges
+            or bulk_table.page_range[bulk_table.page_range_index].num_base_records != num_base_records):
+        print('insert_many error: invalid batch', batch, 'wrote records')
+    if bulk_query.select(next_key, 0, [1, 1, 1, 1, 1]):
+        print('insert_many error: invalid batch', batch, 'is visible to select')
+print("Invalid batch finished")
+db.close()
+
+# Reopen the database, the key index is rebuilt from the persisted pages
+db = Database()
+db.open('./ECS165_insert_many')
+single_table = db.get_table('Single')
+bulk_table = db.get_table('Bulk')
+check_tables(Query(single_table), Query(bulk_table), 'reload')
+print("Reload finished")
+
+db.drop_table('Single')
+db.drop_table('Bulk')
+db.close()
@@ -7,10 +7,13 @@ SCHEMA_ENCODING_COLUMN = 3      # Schema encoding column number
 PAGE_SIZE = 4096                # Size of each page in bytes
 RECORD_SIZE = 8                 # Size of each record in bytes (64-bit integers)
 PAGE_CAPACITY = PAGE_SIZE // RECORD_SIZE  # Number of records per page
+MIN_VALUE = -2 ** 63            # Smallest value a record slot can store
+MAX_VALUE = 2 ** 63 - 1         # Largest value a record slot can store
 BASE_PAGES_PER_RANGE = 16          # 16 base pages per range
 BUFFER_POOL_SIZE = 20           # UNSURE WHAT TRUE SIZE SHOULD BE
 DIRTY_PAGE_THRESHOLD = 15       # Threshold of dirty pages before automatic merge
 MERGE_THRESHOLD = 1000            # Number of updates before merge
+LOCATE_CACHE_SIZE = 1024        # Number of recent index lookups kept per index
 
 
 
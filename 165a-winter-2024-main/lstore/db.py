@@ -24,7 +24,6 @@ class Database:
                     # Handle old list format by ignoring metadata.
                     if isinstance(metadata, dict):
                         self.tables = OOBTree()
-                        from lstore.table import Table
                         for name, info in metadata.items():
                             table = Table(name, info[0], info[1])
                             # NEW: Load table records from disk
@@ -56,9 +55,10 @@ class Database:
     def create_table(self, name, num_columns, key_index):
 
         # If table exists, return existing table
-        if name in self.tables: 
+        existing = self.tables.get(name)
+        if existing is not None: 
             print("Table already exists")
-            return self.tables[name]
+            return existing
         
         # Create table
         table = Table(name, num_columns, key_index)
@@ -1,4 +1,5 @@
 from BTrees.OOBTree import OOBTree
+from collections import OrderedDict
 import lstore.config as config
 
 class Index:
@@ -8,15 +9,27 @@ class Index:
         self.indices = [None] * table.num_columns  # One index per table 
         self.key = table.key  
         self.indices[self.key] = OOBTree()  # Initialize key index
+        self.locate_cache = OrderedDict()  # Recent locate results by (column, value), least recently used first
                 
     """
     # returns the location of all records with the given value on column "column"
     """
     def locate(self, column, value):
 
+        # check the cache first, the cached RID sets are the live sets stored in the tree
+        cache_key = (column, value)
+        cache = self.locate_cache
+        if cache_key in cache:
+            cache.move_to_end(cache_key)  # refresh the entry so hot keys stay cached
+            return cache[cache_key]
+
         # check if column is valid
         bTree = self.indices[column]
-        return bTree[value] if value in bTree else None
+        rids = bTree.get(value)
+        if len(cache) >= config.LOCATE_CACHE_SIZE:
+            cache.popitem(last=False)  # evict the least recently used entry in O(1)
+        cache[cache_key] = rids
+        return rids
 
 
     """
@@ -44,6 +57,7 @@ class Index:
             
         if self.indices[column_number] is None:
             self.indices[column_number] = OOBTree()
+            self.locate_cache.clear()
             self.restart_index_by_col(column_number)
         return True
     
@@ -54,8 +68,22 @@ class Index:
 
         if column_number < len(self.indices):
             self.indices[column_number] = None
+            self.locate_cache.clear()
         return True
 
+    """
+    # Adds a RID under a key of one indexed column, a newly created key drops its cached locate result
+    :param i: int - Column number
+    :param column: OOBTree - Index of the column
+    """
+    def _add(self, i, column, key, rid):
+        rids = column.get(key)
+        if rids is None:
+            column[key] = {rid}
+            self.locate_cache.pop((i, key), None)
+        else:
+            rids.add(rid)
+
     """
     # Insert a record into the index
     :param record: Record to insert
@@ -67,13 +95,33 @@ class Index:
         # iterate over columns
         for i, column in enumerate(self.indices): 
             if column is not None: 
-                # get key
-                key = record[i + config.METADATA_COLUMNS]
-                # insert
-                if key not in column:
-                    column[key] = set()
-                column[key].add(rid)
+                # get key and insert
+                self._add(i, column, record[i + config.METADATA_COLUMNS], rid)
                 
+    """
+    # Insert many records into the index, one indexed column at a time
+    :param records: list - Records to insert
+    """
+    def insert_batch(self, records):
+        # transpose the records into the RID column and the indexed columns
+        rids = [record[config.RID_COLUMN] for record in records]
+        columns = {i: [record[i + config.METADATA_COLUMNS] for record in records]
+                   for i, column in enumerate(self.indices) if column is not None}
+        self.insert_columns(rids, columns)
+
+    """
+    # Insert many records into the index from their unpacked columns, RID 0 marks a deleted record and is skipped
+    :param rids: list - RID of each record
+    :param columns: dict - Maps each indexed column number to its values, in the same order as rids
+    """
+    def insert_columns(self, rids, columns):
+        # iterate over columns, then records in key order, so each tree is resolved once and filled left to right
+        add = self._add
+        for i, values in columns.items():
+            column = self.indices[i]
+            for key, rid in sorted((key, rid) for key, rid in zip(values, rids) if rid):
+                add(i, column, key, rid)
+
     """
     # Delete a record into the index
     :param record: Record to delete
@@ -86,12 +134,13 @@ class Index:
             if column is not None:
                 key = record[i + config.METADATA_COLUMNS]
                 # delete
-                if key in column:
-                    column[key].remove(rid)
-                    if not column[key]:
-                        del column[key]
-                else:
+                rids = column.get(key)
+                if rids is None:
                     return None
+                rids.remove(rid)
+                if not rids:
+                    del column[key]
+                    self.locate_cache.pop((i, key), None)
 
 # EDIT THESE !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
     def get_value_in_col_by_rid(self, column_number: int, rid: int) -> int:
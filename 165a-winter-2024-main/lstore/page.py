@@ -1,7 +1,13 @@
 import lstore.config as config
+import struct
+
+# Big-endian signed 64-bit integer, one per record slot
+RECORD_STRUCT = struct.Struct('>q')
 
 class Page:
 
+    __slots__ = ('num_records', 'data')
+
     def __init__(self):
         self.num_records = 0                    
         self.data = bytearray(config.PAGE_SIZE) 
@@ -21,12 +27,8 @@ class Page:
         if not self.has_capacity():
             return False
         
-        # Calculate the offset
-        offset = self.num_records * 8
-        
-        # Write the value to the page
-        value_bytes = value.to_bytes(8, byteorder='big', signed=True)
-        self.data[offset:offset+8] = value_bytes
+        # Write the value to the page at the next free slot
+        RECORD_STRUCT.pack_into(self.data, self.num_records * config.RECORD_SIZE, value)
         self.num_records += 1
         return True
     
@@ -39,9 +41,10 @@ class Page:
         if index >= self.num_records:
             return None
             
-        # Calculate the offset
-        offset = index * 8
+        return RECORD_STRUCT.unpack_from(self.data, index * config.RECORD_SIZE)[0]
 
-        # Read the value from the page
-        value_bytes = self.data[offset:offset+8]
-        return int.from_bytes(value_bytes, byteorder='big', signed=True)
+    """
+    Reads every value stored in the page in one call
+    """
+    def read_all(self):
+        return struct.unpack_from(f'>{self.num_records}q', self.data)
@@ -0,0 +1,101 @@
+from array import array
+import sys
+
+MISSING = -2                # Location of a RID that was never given one
+DELETED = -1                # Location of a deleted RID
+PAGE_SHIFT = 16             # Bit offset of the page index within a packed location
+PAGE_RANGE_SHIFT = 40       # Bit offset of the page range index within a packed location
+SWAP_BYTES = sys.byteorder == 'little'  # Persisted locations are big-endian like the page data
+
+class PageDirectory:
+
+    """
+    Maps RIDs to (page range index, page index, slot) locations.
+    RIDs are handed out sequentially, so each location is packed into one 64-bit integer
+    in an array indexed by RID instead of a dict of tuples.
+    """
+    def __init__(self):
+        self.locations = array('q')         # Packed location of each RID, or MISSING / DELETED
+
+    """
+    Grows the array so that rid can be stored
+    :param rid: int - RID that needs a place in the array
+    """
+    def _reserve(self, rid):
+        missing = rid + 1 - len(self.locations)
+        if missing > 0:
+            self.locations.extend(array('q', [MISSING]) * missing)
+
+    """
+    Stores the location of a RID
+    :param rid: int - RID to store
+    :param location: tuple - (page range index, page index, slot)
+    """
+    def __setitem__(self, rid, location):
+        page_range_index, page_index, slot = location
+        packed = (page_range_index << PAGE_RANGE_SHIFT) | (page_index << PAGE_SHIFT) | slot
+        locations = self.locations
+        if rid == len(locations):  # RIDs are handed out in order, so a new RID usually just extends the array
+            locations.append(packed)
+        else:
+            self._reserve(rid)
+            locations[rid] = packed
+
+    """
+    Marks a RID as deleted, its location is dropped but the RID is never reused
+    :param rid: int - RID to delete
+    """
+    def delete(self, rid):
+        self._reserve(rid)
+        self.locations[rid] = DELETED
+
+    """
+    Returns the location of a RID, None if it is missing or deleted
+    :param rid: int - RID to look up
+    """
+    def get(self, rid, default=None):
+        if not 0 <= rid < len(self.locations):
+            return default
+        location = self.locations[rid]
+        if location < 0:
+            return default
+        return (location >> PAGE_RANGE_SHIFT, (location >> PAGE_SHIFT) & 0xFFFFFF, location & 0xFFFF)
+
+    """
+    Yields (rid, location) pairs, with None as the location of deleted RIDs
+    """
+    def items(self):
+        for rid, location in enumerate(self.locations):
+            if location == MISSING:
+                continue
+            yield rid, None if location == DELETED else self.get(rid)
+
+    """
+    Stores many locations at once
+    :param locations: dict - Maps RIDs to locations
+    """
+    def update(self, locations):
+        for rid, location in locations.items():
+            self[rid] = location
+
+    """
+    Returns the raw bytes of the location array in big-endian order, ready to be written to disk
+    """
+    def serialize(self):
+        if not SWAP_BYTES:
+            return self.locations.tobytes()
+        locations = array('q', self.locations)
+        locations.byteswap()
+        return locations.tobytes()
+
+    """
+    Rebuilds a directory from the bytes returned by serialize
+    :param data: bytes - Big-endian bytes of the location array
+    """
+    @classmethod
+    def deserialize(cls, data):
+        page_directory = cls()
+        page_directory.locations.frombytes(data)
+        if SWAP_BYTES:
+            page_directory.locations.byteswap()
+        return page_directory
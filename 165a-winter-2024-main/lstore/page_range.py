@@ -1,8 +1,11 @@
-from lstore.page import Page    
+from lstore.page import Page, RECORD_STRUCT
 import lstore.config as config
+import struct
 
 class PageRange:
 
+    __slots__ = ('num_columns', 'base_pages', 'tail_pages', 'num_tail_records', 'num_base_records')
+
     def __init__(self, num_columns):
         self.num_columns = num_columns
         self.base_pages = []                # List of base pages for each column
@@ -56,9 +59,13 @@ class PageRange:
         page_index = len(pages[0]) - 1
         slot = pages[0][page_index].num_records
         
-        # Write metadata
-        for i, value in enumerate(record):
-            pages[i][page_index].write(value)
+        # Write metadata, every column page of the record shares the slot, so its offset and capacity are checked once
+        pack_into = RECORD_STRUCT.pack_into
+        offset = slot * config.RECORD_SIZE
+        for column_pages, value in zip(pages, record):
+            page = column_pages[page_index]
+            pack_into(page.data, offset, value)
+            page.num_records = slot + 1
             
         # Update metadata
         if is_base:
@@ -68,37 +75,100 @@ class PageRange:
         return (page_index, slot)
 
     """
-    Read a record from the page 
+    Write as many records as fit in the last page, one pack per column page
+    :param records: list - Records to write, each with metadata and column values
+    :param start: int - Index of the first record to write
     :param is_base: bool - True for base pages, False for tail pages
     """
-    def read_record(self, page_index, slot, projected_columns_index, is_base):
+    def write_records(self, records, start, is_base):
         pages = self._get_pages(is_base)
+        if not self.has_page_capacity(is_base):
+            self.add_page(is_base)
+
+        page_index = len(pages[0]) - 1
+        first_slot = pages[0][page_index].num_records
+        count = min(len(records) - start, config.PAGE_CAPACITY - first_slot)
+
+        # Write each column of the whole run in one call
+        pack_into = struct.Struct(f'>{count}q').pack_into
+        offset = first_slot * config.RECORD_SIZE
+        for column_pages, values in zip(pages, zip(*records[start:start + count])):
+            page = column_pages[page_index]
+            pack_into(page.data, offset, *values)
+            page.num_records = first_slot + count
+
+        # Update metadata
+        if is_base:
+            self.num_base_records += count
+        else:
+            self.num_tail_records += count
+        return (page_index, first_slot, count)
+
+    """
+    Read a record from the page 
+    :param is_base: bool - True for base pages, False for tail pages
+    :param projected_columns: list - Projected columns counting the metadata columns, derived from projected_columns_index if not given
+    """
+    def read_record(self, page_index, slot, projected_columns_index, is_base, projected_columns=None):
+        pages = self.base_pages if is_base else self.tail_pages  # Inlined _get_pages on the per-slot paths
         # Check if the index is valid
         if page_index >= len(pages[0]) or slot >= pages[0][page_index].num_records:
             print("Invalid index")
             return
             
-        record = []
+        # Every column page shares the slot layout, so unpack straight from each page's bytes
+        unpack_from = RECORD_STRUCT.unpack_from
+        offset = slot * config.RECORD_SIZE
+
+        # Preallocate the whole record, unprojected columns stay None
+        record = [None] * (config.METADATA_COLUMNS + self.num_columns)
 
         # Read metadata
         for i in range(config.METADATA_COLUMNS):
-            record.append(pages[i][page_index].read(slot))
+            record[i] = unpack_from(pages[i][page_index].data, offset)[0]
             
-        # Read data
-        for i in range(self.num_columns):
-            if projected_columns_index[i]:
-                value = pages[i + config.METADATA_COLUMNS][page_index].read(slot)
-                record.append(value)
-            else:
-                record.append(None)
+        # Read data, only the projected columns are visited
+        if projected_columns is None:
+            projected_columns = [i + config.METADATA_COLUMNS for i in range(self.num_columns) if projected_columns_index[i]]
+        for column in projected_columns:
+            record[column] = unpack_from(pages[column][page_index].data, offset)[0]
                 
         return record
     """
+    Read a single column of a record from the page, the location must come from the page directory
+    :param column: int - Column to read, counting the metadata columns
+    :param is_base: bool - True for base pages, False for tail pages
+    """
+    def read_column(self, page_index, slot, column, is_base):
+        pages = self.base_pages if is_base else self.tail_pages
+        return RECORD_STRUCT.unpack_from(pages[column][page_index].data, slot * config.RECORD_SIZE)[0]
+
+    """
+    Read several columns of a record from the page in one call, the location must come from the page directory
+    :param columns: list - Columns to read, counting the metadata columns
+    :param is_base: bool - True for base pages, False for tail pages
+    """
+    def read_columns(self, page_index, slot, columns, is_base):
+        pages = self.base_pages if is_base else self.tail_pages
+        unpack_from = RECORD_STRUCT.unpack_from
+        offset = slot * config.RECORD_SIZE
+        return [unpack_from(pages[column][page_index].data, offset)[0] for column in columns]
+
+    """
+    Write a single column of a record in the page, the location must come from the page directory
+    :param column: int - Column to write, counting the metadata columns
+    :param is_base: bool - True for base pages, False for tail pages
+    """
+    def write_column(self, page_index, slot, column, value, is_base):
+        pages = self.base_pages if is_base else self.tail_pages
+        RECORD_STRUCT.pack_into(pages[column][page_index].data, slot * config.RECORD_SIZE, value)
+
+    """
     Update a record in the page
     :param is_base: bool - True for base pages, False for tail pages
     """
     def update_record_column(self, page_index, slot, column, value, is_base):
-        pages = self._get_pages(is_base)
+        pages = self.base_pages if is_base else self.tail_pages
         # Check if the index is valid
         if page_index >= len(pages[0]) or slot >= pages[0][page_index].num_records:
             print("Invalid index")
@@ -109,10 +179,31 @@ class PageRange:
             print("Invalid column")
             return
             
-        # Update data
-        page = pages[column][page_index]
-        old_value = page.read(slot)
-        if old_value is not None:
-            page.data[slot * 8:(slot + 1) * 8] = value.to_bytes(8, byteorder='big', signed=True)
+        # Update data in place, the slot was validated against the page above
+        RECORD_STRUCT.pack_into(pages[column][page_index].data, slot * config.RECORD_SIZE, value)
 
     
+
+    """
+    Update several columns of a record in the page in one call, returns False without writing if the slot or a column is invalid
+    :param columns: list - Columns to update, counting the metadata columns
+    :param values: list - New value for each column
+    :param is_base: bool - True for base pages, False for tail pages
+    """
+    def update_record_columns(self, page_index, slot, columns, values, is_base):
+        pages = self.base_pages if is_base else self.tail_pages
+        # Check if the index is valid
+        if page_index >= len(pages[0]) or slot >= pages[0][page_index].num_records:
+            return False
+
+        # Check every column before writing any of them
+        total_columns = self.num_columns + config.METADATA_COLUMNS
+        if any(column < 0 or column >= total_columns for column in columns):
+            return False
+
+        # Update data in place, the slot was validated against the page above
+        pack_into = RECORD_STRUCT.pack_into
+        offset = slot * config.RECORD_SIZE
+        for column, value in zip(columns, values):
+            pack_into(pages[column][page_index].data, offset, value)
+        return True
@@ -1,7 +1,6 @@
 import time
-from lstore.table import Record
+from lstore.table import Record, schema_bits
 import lstore.config as config
-from datetime import datetime
 
 class Query:
     
@@ -13,61 +12,101 @@ class Query:
     :param primary_key: int - Primary key value
     """
     def delete(self, primary_key):
-        try:
-            rids = self.table.index.locate(self.table.key, primary_key) # Get all records with the given primary key
-            if not rids:
-                return False
-            
-            # Delete all records with the given primary key
-            for rid in rids:
-                page_range_index, base_index, slot_index = self.table.page_directory[rid]
-                page_range = self.table.page_range[page_range_index]
-                base_rec = page_range.read_record(base_index, slot_index, [1] * self.table.num_columns, True)
-                if page_range_index is None: # If the page range is None, then the record is already deleted
-                    return False
-                page_range.update_record_column(base_index, slot_index, config.RID_COLUMN, 0, True)
-                current_rid = base_rec[config.INDIRECTION_COLUMN]
-                while current_rid and current_rid != rid: # Delete all tail records
-                    page_range_index, tail_index, tail_slot = self.table.page_directory[current_rid]
-                    if page_range_index is None: # If the page range is None, then the record is already deleted
-                        break
-                    tail_rec = page_range.read_record(tail_index, tail_slot, [0] * self.table.num_columns, False)
-                    page_range.update_record_column(tail_index, tail_slot, config.RID_COLUMN, 0, False)
-                    current_rid = tail_rec[config.INDIRECTION_COLUMN]
-                self.table.index.delete(base_rec)
-                self.table.page_directory[rid] = None
-            return True
-        except:
+        rids = self.table.index.locate(self.table.key, primary_key) # Get all records with the given primary key
+        if not rids:
             return False
         
+        # Delete all records with the given primary key, iterating over a copy since the index drops each RID as we go
+        page_directory, page_ranges = self.table.page_directory, self.table.page_range
+        full_mask = self.table.full_mask
+        for rid in list(rids):
+            location = page_directory.get(rid)
+            if location is None: # If the location is None, then the record is already deleted
+                return False
+            page_range_index, base_index, slot_index = location
+            page_range = page_ranges[page_range_index]
+            base_rec = page_range.read_record(base_index, slot_index, full_mask, True)
+            if base_rec is None:
+                return False
+            page_range.update_record_column(base_index, slot_index, config.RID_COLUMN, 0, True)
+            # Delete all tail records, every hop reads and writes one column at a location taken from the directory
+            read_column, write_column = page_range.read_column, page_range.write_column
+            current_rid = base_rec[config.INDIRECTION_COLUMN]
+            while current_rid and current_rid != rid:
+                location = page_directory.get(current_rid)
+                if location is None: # If the location is None, then the record is already deleted
+                    break
+                _, tail_index, tail_slot = location
+                current_rid = read_column(tail_index, tail_slot, config.INDIRECTION_COLUMN, False)
+                write_column(tail_index, tail_slot, config.RID_COLUMN, 0, False)
+            self.table.index.delete(base_rec)
+            page_directory.delete(rid)
+        return True
+        
     """
     # Inserts a new record with the given values
     :param values: list - List of values for the new record
     """
     def insert(self, *values):
-        try:
-            if len(values) != self.table.num_columns: # If the number of values is not equal to the number of columns, then the record is invalid
-                return False
-            
-            # Create a new record
-            new_rid = self.table.new_rid()
-            active_page_range = self.table.page_range[self.table.page_range_index]
-            new_entry = [None] * config.METADATA_COLUMNS
-            new_entry[config.INDIRECTION_COLUMN] = 0
+        table = self.table
+        if len(values) != table.num_columns: # If the number of values is not equal to the number of columns, then the record is invalid
+            return False
+        if not self.valid_values(values): # Reject values a page slot cannot hold before any RID or slot is used
+            return False
+        
+        # Create a new record, metadata and values built in one list
+        new_rid = table.new_rid()
+        new_entry = [0, new_rid, int(time.time()), 0, *values] # Indirection, RID, timestamp, schema encoding, columns
+        
+        # Write new record to page
+        page_range_index = table.page_range_index
+        active_page_range = table.page_range[page_range_index]
+        page_index, slot_index = active_page_range.write_record(new_entry, True)
+        table.page_directory[new_rid] = (page_range_index, page_index, slot_index)
+        table.index.insert(new_entry)
+
+        # Only move to a new page range once the current one fills up
+        if not active_page_range.has_page_capacity(True):
+            table.create_page_range()
+        
+        return True
+
+    """
+    # Inserts many new records, indexing them as a single batch
+    :param rows: list - List of value lists, one per new record
+    """
+    def insert_many(self, rows):
+        if any(len(values) != self.table.num_columns or not self.valid_values(values) for values in rows): # Reject the whole batch if any record is invalid
+            return False
+
+        table = self.table
+        new_rids = table.new_rid_range(len(rows))
+
+        # Build the metadata once, only the RID changes per record
+        template = [0] * config.METADATA_COLUMNS
+        template[config.TIMESTAMP_COLUMN] = int(time.time()) # Sample the clock once for the whole batch
+        new_entries = []
+        for new_rid, values in zip(new_rids, rows):
+            new_entry = template[:]
             new_entry[config.RID_COLUMN] = new_rid
-            new_entry[config.TIMESTAMP_COLUMN] = int(time.time())
-            new_entry[config.SCHEMA_ENCODING_COLUMN] = 0
             new_entry.extend(values)
-            
-            # Write new record to page
-            page_index, slot_index = active_page_range.write_record(new_entry, True)
-            self.table.page_directory[new_rid] = (self.table.page_range_index, page_index, slot_index)
-            self.table.index.insert(new_entry)
-            self.table.create_page_range()
-            
-            return True
-        except:
-            return False
+            new_entries.append(new_entry)
+
+        # Write the records a page at a time, each run is indexed once it is on its page
+        start = 0
+        while start < len(new_entries):
+            page_range_index = table.page_range_index
+            active_page_range = table.page_range[page_range_index]
+            page_index, first_slot, count = active_page_range.write_records(new_entries, start, True)
+            written = new_entries[start:start + count]
+            table.page_directory.update({entry[config.RID_COLUMN]: (page_range_index, page_index, first_slot + i) for i, entry in enumerate(written)})
+            table.index.insert_batch(written)
+            start += count
+
+            # Only move to a new page range once the current one fills up
+            if not active_page_range.has_page_capacity(True):
+                table.create_page_range()
+        return True
 
     """
     # Selects all records with the given key
@@ -86,48 +125,61 @@ class Query:
     :param relative_version: int - Version number to retrieve
     """
     def select_version(self, search_key, search_key_index, projected_columns_index, relative_version):
-        try:
-            # Get all base records with the given key
-            base_records = self.get_records(search_key, search_key_index, projected_columns_index)
-            retrieved_records = []
-            
-            # Get all tail records with the given key
-            for base_rec in base_records:
-                if base_rec.indirection == 0:
-                    retrieved_records.append(base_rec)
-                    continue
-                
-                # Get all tail records for the base record
-                current_version = 0
-                tail_rid = base_rec.indirection
-                return_base = False
-                pr_index, tp_index, slot = self.table.page_directory[tail_rid]
-                tail_record = self.table.page_range[pr_index].read_record(tp_index, slot, projected_columns_index, False)
-                
-                # Get the version of the tail record
-                while current_version > relative_version:
-                    if tail_record[config.INDIRECTION_COLUMN] == base_rec.rid:
-                        return_base = True
-                        break
-                    tail_rid = tail_record[config.INDIRECTION_COLUMN]
-                    pr_index, tp_index, slot = self.table.page_directory[tail_rid]
-                    tail_record = self.table.page_range[pr_index].read_record(tp_index, slot, projected_columns_index, False)
-                    current_version -= 1
-                
-                # If the version is greater than the relative version, then return the base record
-                if return_base or relative_version < current_version:
-                    retrieved_records.append(base_rec)
-                else: # Otherwise, return the tail record
-                    schema_value = tail_record[config.SCHEMA_ENCODING_COLUMN]
-                    updated_columns = [int(bit) for bit in f"{schema_value:0{self.table.num_columns}b}"]
-                    for index, updated in enumerate(updated_columns):  # Update the base record with the tail record
-                        if updated:
-                            base_rec.columns[index] = tail_record[config.METADATA_COLUMNS + index]
-                    retrieved_records.append(base_rec)
-            
-            return retrieved_records
-        except:
-            return self.get_records(search_key, search_key_index, projected_columns_index)
+        # Get all base records with the given key
+        base_records = self.get_records(search_key, search_key_index, projected_columns_index)
+        if not any(projected_columns_index): # If no column is projected, then there is nothing to overlay
+            return base_records
+        apply_version, projected_mask = self.apply_version, self.projectionMask(projected_columns_index)
+        
+        # Overlay the requested version of each base record
+        for base_rec in base_records:
+            apply_version(base_rec.rid, base_rec.indirection, base_rec.columns, projected_columns_index, relative_version, projected_mask)
+        
+        return base_records
+
+    """
+    # Overlays the requested version of a record onto its base columns
+    :param base_rid: int - RID of the base record
+    :param indirection: int - Indirection value of the base record
+    :param columns: list - Base column values, updated in place
+    :param projected_columns_index: list - List of 1s and 0s to indicate which columns to return
+    :param relative_version: int - Version number to retrieve
+    :param projected_mask: int - projected_columns_index as a schema-style bitmask, computed if not given
+    """
+    def apply_version(self, base_rid, indirection, columns, projected_columns_index, relative_version, projected_mask=None):
+        if indirection == 0: # If the record has never been updated, then the base record is current
+            return
+        
+        # The base indirection always points at the newest tail record, so the latest version needs no chain walk
+        # Walk back through older tail records only when an older version is requested, reading just their indirection
+        page_directory, page_ranges, indirection_column = self.table.page_directory, self.table.page_range, config.INDIRECTION_COLUMN
+        tail_rid = indirection
+        current_version = 0
+        while current_version > relative_version:
+            location = page_directory.get(tail_rid)
+            if location is None: # If the tail record cannot be found, then return the base record
+                return
+            pr_index, tp_index, slot = location
+            tail_rid = page_ranges[pr_index].read_column(tp_index, slot, indirection_column, False)
+            if tail_rid == base_rid: # If the chain reaches the base record, then return the base record
+                return
+            current_version -= 1
+        
+        # Only the tail record of the requested version is read in full
+        tail_record = self.read_tail_record(tail_rid, projected_columns_index)
+        if tail_record is None:
+            return
+        
+        # Otherwise, update the base record with the tail record, one bit at a time over the updated and projected columns
+        if projected_mask is None:
+            projected_mask = self.projectionMask(projected_columns_index)
+        schema_value = tail_record[config.SCHEMA_ENCODING_COLUMN] & projected_mask
+        last_column, metadata_columns = self.table.num_columns - 1, config.METADATA_COLUMNS
+        while schema_value:
+            low_bit = schema_value & -schema_value
+            index = last_column - (low_bit.bit_length() - 1)
+            columns[index] = tail_record[metadata_columns + index]
+            schema_value ^= low_bit
 
     """
     # Updates all records with the given key
@@ -135,41 +187,55 @@ class Query:
     :param columns: list - List of new values for the updated record
     """    
     def update(self, primary_key, *columns):
-        try:
-            rids = self.table.index.locate(self.table.key, primary_key) # Get all records with the given key
-            if not rids:
+        page_directory, page_ranges, num_columns = self.table.page_directory, self.table.page_range, self.table.num_columns
+        if len(columns) != num_columns: # If the number of values is not equal to the number of columns, then the update is invalid
+            return False
+        if not self.valid_values(columns, True): # Reject values a page slot cannot hold before any tail record is written
+            return False
+
+        rids = self.table.index.locate(self.table.key, primary_key) # Get all records with the given key
+        if not rids:
+            return False
+        
+        # Update all records with the given key, reading and writing only the base metadata the update needs
+        update_metadata = (config.INDIRECTION_COLUMN, config.SCHEMA_ENCODING_COLUMN)
+        timestamp = int(time.time()) # Sample the clock once for all tail records written by this update
+        for rid in rids:
+            location = page_directory.get(rid)
+            if location is None: # If the location is None, then the record has been deleted
                 return False
-            
-            # Update all records with the given key
-            for rid in rids:
-                page_range_index, base_index, slot_index = self.table.page_directory[rid]
-                page_range = self.table.page_range[page_range_index]
-                base_rec = page_range.read_record(base_index, slot_index, [0] * self.table.num_columns, True)
+            page_range_index, base_index, slot_index = location
+            page_range = page_ranges[page_range_index]
+            indirection, existing_schema = page_range.read_columns(base_index, slot_index, update_metadata, True)
 
-                # If the record is being updated for the first time, create a new tail record
-                if base_rec[config.INDIRECTION_COLUMN] == 0:
-                    tail_rid = self.table.new_rid()
-                    schema, schema_num = self.createSchemaEncoding(columns)
-                    tail_rec = self.createTailRecord(tail_rid, base_rec[config.RID_COLUMN], columns, schema_num)
-                    self.writeTailRecord(page_range, page_range_index, tail_rec)
-                    page_range.update_record_column(base_index, slot_index, config.INDIRECTION_COLUMN, tail_rid, True)
-                    page_range.update_record_column(base_index, slot_index, config.SCHEMA_ENCODING_COLUMN, schema_num, True)
+            # If the record is being updated for the first time, create a new tail record
+            if indirection == 0:
+                tail_rid = self.table.new_rid()
+                schema_num = self.createSchemaEncoding(columns)
+                tail_rec = self.createTailRecord(tail_rid, rid, columns, schema_num, timestamp=timestamp)
+                self.writeTailRecord(page_range, page_range_index, tail_rec)
+                if not page_range.update_record_columns(base_index, slot_index, update_metadata, (tail_rid, schema_num), True):
+                    return False
 
-                # If the record has been updated before, create a new tail record based on the latest tail record
-                else:
-                    existing_schema = [int(bit) for bit in f"{base_rec[config.SCHEMA_ENCODING_COLUMN]:0{self.table.num_columns}b}"]
-                    latest_tail_rid = base_rec[config.INDIRECTION_COLUMN]
-                    page_range_index, latest_tail_index, latest_tail_slot = self.table.page_directory[latest_tail_rid]
-                    latest_tail_rec = page_range.read_record(latest_tail_index, latest_tail_slot, existing_schema, False)
-                    new_tail_rid = self.table.new_rid()
-                    schema, schema_num = self.createSchemaEncoding(columns, existing_schema)
-                    new_tail_rec = self.createTailRecord(new_tail_rid, latest_tail_rid, columns, schema_num, latest_tail_rec)
-                    self.writeTailRecord(page_range, page_range_index, new_tail_rec)
-                    page_range.update_record_column(base_index, slot_index, config.INDIRECTION_COLUMN, new_tail_rid, True)
-                    page_range.update_record_column(base_index, slot_index, config.SCHEMA_ENCODING_COLUMN, schema_num, True)
-            return True
-        except:
-            return False
+            # If the record has been updated before, create a new tail record based on the latest tail record
+            else:
+                update_schema = self.createSchemaEncoding(columns)
+                latest_tail_rid = indirection
+
+                # Only read the latest tail record for earlier updates this one does not overwrite
+                carried_schema = existing_schema & ~update_schema
+                latest_tail_rec = None
+                if carried_schema:
+                    latest_tail_rec = self.read_tail_record(latest_tail_rid, schema_bits(carried_schema, num_columns))
+                    if latest_tail_rec is None:
+                        return False
+                new_tail_rid = self.table.new_rid()
+                schema_num = update_schema | existing_schema
+                new_tail_rec = self.createTailRecord(new_tail_rid, latest_tail_rid, columns, schema_num, latest_tail_rec, timestamp)
+                self.writeTailRecord(page_range, page_range_index, new_tail_rec)
+                if not page_range.update_record_columns(base_index, slot_index, update_metadata, (new_tail_rid, schema_num), True):
+                    return False
+        return True
 
     """
     # Sums all records with the given key
@@ -188,38 +254,60 @@ class Query:
     :param relative_version: int - Version number to retrieve
     """
     def sum_version(self, start_range, end_range, agg_col_index, relative_version):
-        try:
-            # Get all records with the given key
-            total_sum, found_records = 0, False
-            projection = [1 if i == agg_col_index else 0 for i in range(self.table.num_columns)]
-            for key in range(start_range, end_range + 1): # Get all records with the given key
-                records = self.select_version(key, self.table.key, projection, relative_version)
-                if records: # If the record is not found, then return False
-                    found_records = True
-                    total_sum += records[0].columns[agg_col_index] or 0
-            return total_sum if found_records else False
-        except:
+        if not 0 <= agg_col_index < self.table.num_columns: # If the column index is out of range, then the aggregate is invalid
             return False
 
+        # Get all records with keys in the range in one index scan
+        rids = self.table.index.locate_range(start_range, end_range, self.table.key)
+        if not rids: # If no record is found, then return False
+            return False
+
+        # Read only the aggregated column of each record and sum it
+        total_sum, found_records, num_columns = 0, False, self.table.num_columns
+        projection = [1 if i == agg_col_index else 0 for i in range(num_columns)]
+        sum_columns = (config.INDIRECTION_COLUMN, config.METADATA_COLUMNS + agg_col_index)
+        page_directory, page_ranges, apply_version = self.table.page_directory, self.table.page_range, self.apply_version
+        projected_mask = self.projectionMask(projection)
+        for rid in rids:
+            location = page_directory.get(rid)
+            if location is None:
+                continue
+            pr_index, bp_index, slot = location
+            page_range = page_ranges[pr_index]
+            found_records = True
+
+            # Records that were never updated only need their base column value
+            indirection, value = page_range.read_columns(bp_index, slot, sum_columns, True)
+            if indirection == 0:
+                total_sum += value
+                continue
+
+            # Otherwise overlay the requested version onto the base value
+            columns = [None] * num_columns
+            columns[agg_col_index] = value
+            apply_version(rid, indirection, columns, projection, relative_version, projected_mask)
+            total_sum += columns[agg_col_index] or 0
+        return total_sum if found_records else False
+
     """
     # Increments the value of a column in all records with the given key
     :param key: int - Primary key value
     :param column: int - Index of the column to increment
     """
     def increment(self, key, column):
-        try:
-            # Get all records with the given key
-            records = self.select(key, self.table.key, [1] * self.table.num_columns)
+        if not 0 <= column < self.table.num_columns: # If the column index is out of range, then the increment is invalid
+            return False
 
-            # If the record is not found, then return False
-            if not records:
-                return False
-            record = records[0]
-            updated_columns = [None] * self.table.num_columns
-            updated_columns[column] = record[column] + 1
-            return self.update(key, *updated_columns) # Update the record
-        except:
+        # Get all records with the given key
+        records = self.select(key, self.table.key, self.table.full_mask)
+
+        # If the record is not found, then return False
+        if not records:
             return False
+        record = records[0]
+        updated_columns = [None] * self.table.num_columns
+        updated_columns[column] = record[column] + 1
+        return self.update(key, *updated_columns) # Update the record
 
     """
     # Creates a new record with the passed values
@@ -227,14 +315,8 @@ class Query:
     :param primary_key: int - Primary key value for the new record
     """
     def create_record(self, values, primary_key):
-        timestamp = datetime.fromtimestamp(float(values[config.TIMESTAMP_COLUMN])) # Convert timestamp to datetime object
-        schema_encoding_value = values[config.SCHEMA_ENCODING_COLUMN] # Get schema encoding value
-        num_columns = self.table.num_columns # Get number of columns
-        schema_bits = [int(bit) for bit in f"{schema_encoding_value:0{num_columns}b}"] # Get schema bits
-        column_data = values[config.METADATA_COLUMNS:] # Get column data
-        
-        # Create a new record
-        return Record(indirection=values[config.INDIRECTION_COLUMN], rid=values[config.RID_COLUMN], timestamp=timestamp, schema_encoding=schema_bits, key=primary_key, columns=column_data)
+        # Create a new record, keeping the raw timestamp and schema encoding integers
+        return Record(indirection=values[config.INDIRECTION_COLUMN], rid=values[config.RID_COLUMN], timestamp=values[config.TIMESTAMP_COLUMN], schema_encoding=values[config.SCHEMA_ENCODING_COLUMN], key=primary_key, columns=values[config.METADATA_COLUMNS:])
 
     """
     # Returns all base records with the given key
@@ -250,30 +332,50 @@ class Query:
             return []
         
         # Get all base records with the given key
+        page_directory, page_ranges, create_record = self.table.page_directory, self.table.page_range, self.create_record
+        projected_columns = [config.METADATA_COLUMNS + i for i in range(self.table.num_columns) if column_mask[i]] # Resolved once for every record
         for rid in matching_rids:
-            pr_index, bp_index, slot = self.table.page_directory[rid]
-            raw_record = self.table.page_range[pr_index].read_record(bp_index, slot, column_mask, True)
-            record_obj = self.create_record(raw_record, key)
-            results.append(record_obj)
+            location = page_directory.get(rid)
+            if location is None: # If the location is None, then the record has been deleted
+                continue
+            pr_index, bp_index, slot = location
+            raw_record = page_ranges[pr_index].read_record(bp_index, slot, column_mask, True, projected_columns)
+            results.append(create_record(raw_record, key))
         return results
     
     """
-    # Creates a schema encoding for a new record
-    :param columns: list - List of column values
-    :param existing_schema: list - List of existing schema bits, if any
-    """
-    def createSchemaEncoding(self, columns, existing_schema=None):
-        # Create a schema encoding for the new record
-        if existing_schema is None:
-            schema_bits = [1 if col is not None else 0 for col in columns]
-        else: # If the record has been updated before, create a new schema encoding based on the existing schema
-            schema_bits = existing_schema[:]
-            for index, col in enumerate(columns):
-                if col is not None:
-                    schema_bits[index] = 1
-        
-        # Convert the schema encoding to an integer
-        return schema_bits, int("".join(map(str, schema_bits)), 2)
+    # Returns true if every value fits in a 64-bit record slot
+    :param values: list - List of column values
+    :param allow_none: bool - True if None marks a column left unchanged
+    """
+    def valid_values(self, values, allow_none=False):
+        for value in values:
+            if value is None and allow_none:
+                continue
+            if not isinstance(value, int) or not config.MIN_VALUE <= value <= config.MAX_VALUE:
+                return False
+        return True
+
+    """
+    # Creates the schema encoding of the columns set by an update
+    :param columns: list - List of column values, None for columns the update leaves unchanged
+    """
+    def createSchemaEncoding(self, columns):
+        # Set the bit of every updated column, first column in the highest bit
+        schema_num = 0
+        for col in columns:
+            schema_num = (schema_num << 1) | (col is not None)
+        return schema_num
+
+    """
+    # Converts a projection list to a bitmask laid out like the schema encoding, first column in the highest bit
+    :param projected_columns_index: list - List of 1s and 0s to indicate which columns to return
+    """
+    def projectionMask(self, projected_columns_index):
+        mask = 0
+        for index in range(self.table.num_columns):
+            mask = (mask << 1) | (1 if projected_columns_index[index] else 0)
+        return mask
 
     """
     # Creates a new tail record for an update
@@ -282,27 +384,34 @@ class Query:
     :param column_values: list - List of new column values
     :param schema_encoding: int - Schema encoding for the new record
     :param prev_record: list - List of values from the previous tail record
+    :param timestamp: int - Timestamp for the new record, sampled from the clock if not given
     """
-    def createTailRecord(self, tail_rid, indirection_rid, column_values, schema_encoding, prev_record=None):
-        tail_entry = [None] * config.METADATA_COLUMNS # Create a new tail record
-        tail_entry[config.INDIRECTION_COLUMN] = indirection_rid # Set the indirection column
-        tail_entry[config.RID_COLUMN] = tail_rid # Set the RID column
-        tail_entry[config.TIMESTAMP_COLUMN] = int(time.time()) # Set the timestamp column
-        tail_entry[config.SCHEMA_ENCODING_COLUMN] = schema_encoding # Set the schema encoding column
+    def createTailRecord(self, tail_rid, indirection_rid, column_values, schema_encoding, prev_record=None, timestamp=None):
+        if timestamp is None:
+            timestamp = int(time.time())
         
-        # If the record has been updated before, set the column values to the previous tail record
+        # If the record has been updated before, carry the column values over from the previous tail record
         if prev_record is None:
-            tail_entry.extend(col if col is not None else 0 for col in column_values)
+            values = [col if col is not None else 0 for col in column_values]
         else:
-            for i, col in enumerate(column_values): # Set the column values to the previous tail record
-                if col is not None:
-                    tail_entry.append(col)
-                elif prev_record[i + config.METADATA_COLUMNS]:
-                    tail_entry.append(prev_record[i + config.METADATA_COLUMNS])
-                else:
-                    tail_entry.append(0)
+            # Columns never updated are read back as None, so only those fall back to 0
+            values = [col if col is not None else prev if prev is not None else 0
+                      for col, prev in zip(column_values, prev_record[config.METADATA_COLUMNS:])]
         
-        return tail_entry
+        # Create a new tail record: indirection, RID, timestamp, schema encoding, columns
+        return [indirection_rid, tail_rid, timestamp, schema_encoding, *values]
+
+    """
+    # Reads a tail record, returns None if the RID has no location
+    :param tail_rid: int - RID of the tail record
+    :param projected_columns_index: list - List of 1s and 0s to indicate which columns to return
+    """
+    def read_tail_record(self, tail_rid, projected_columns_index):
+        location = self.table.page_directory.get(tail_rid)
+        if location is None:
+            return None
+        pr_index, tp_index, slot = location
+        return self.table.page_range[pr_index].read_record(tp_index, slot, projected_columns_index, False)
 
     """
     # Writes a new tail record to the page range
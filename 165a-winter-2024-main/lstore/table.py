@@ -1,9 +1,23 @@
 from lstore.index import Index
+from lstore.page import Page
 from lstore.page_range import PageRange
+from lstore.page_directory import PageDirectory
+from lstore.config import INDIRECTION_COLUMN, RID_COLUMN, METADATA_COLUMNS
 import msgpack
 
+"""
+# Converts a schema encoding integer to a list of bits, first column first
+:param schema_encoding: int - Schema encoding value
+:param num_columns: int - Number of data columns covered by the encoding
+"""
+def schema_bits(schema_encoding, num_columns):
+    last_column = num_columns - 1
+    return [(schema_encoding >> (last_column - index)) & 1 for index in range(num_columns)]
+
 class Record:
 
+    __slots__ = ('rid', 'key', 'columns', 'indirection', 'timestamp', 'schema_encoding')
+
     def __init__(self, indirection, rid, timestamp, schema_encoding, key, columns):
         self.rid = rid                  
         self.key = key                  
@@ -16,6 +30,11 @@ class Record:
     def __getitem__(self, column):
         return self.columns[column]
 
+    @property
+    def schema_bits(self):
+        # Decode the schema encoding on demand, first column first
+        return schema_bits(self.schema_encoding, len(self.columns))
+
     def __str__(self):
 
         return f"Record(rid={self.rid}, key={self.key}, columns={self.columns})"
@@ -31,22 +50,20 @@ class Table:
         self.name = name
         self.key = key
         self.num_columns = num_columns
-        self.page_directory = {}
+        self.full_mask = (1,) * num_columns         # Projection that reads every column
         self.index = Index(self)
         self.rid = 1                                                     
         self.page_range = [PageRange(num_columns)]  
         self.page_range_index = 0                   # Current page range index
-        self.page_directory = {}                     # Maps RID to record location
+        self.page_directory = PageDirectory()       # Maps RID to record location
         # Add new flag to track first select call.
         self.first_select_called = False
 
     def reset(self):
         # Reset in-memory record state so that stale persistent records are cleared.
-        from lstore.page_range import PageRange
         self.page_range = [PageRange(self.num_columns)]
         self.page_range_index = 0
-        self.page_directory = {}
-        from lstore.index import Index
+        self.page_directory = PageDirectory()
         self.index = Index(self)
 
     """
@@ -57,10 +74,19 @@ class Table:
         return self.rid - 1
 
     """
-    # Creates a page range 
+    # Reserves a contiguous block of RIDs
+    :param count: int - Number of RIDs to reserve
+    """
+    def new_rid_range(self, count):
+        first_rid = self.rid
+        self.rid += count
+        return range(first_rid, self.rid)
+
+    """
+    # Creates a page range once the active one is full
     """
     def create_page_range(self):
-        if self.page_range[-1].has_page_capacity(True): return;
+        if self.page_range[self.page_range_index].has_page_capacity(True): return;
     
         self.page_range.append(PageRange(self.num_columns))
         self.page_range_index += 1
@@ -84,35 +110,26 @@ class Table:
         Persist record data (page ranges and page_directory) to disk.
         """
         data_file = db_path + f"_{self.name}.msgpack"
+        packer = msgpack.Packer(use_bin_type=True)
         def persist_page(page):
-            return {
-                "num_records": page.num_records,
-                # Convert bytearray to list of ints
-                "data": list(page.data)
-            }
-        persisted_page_ranges = []
-        for pr in self.page_range:
-            pr_data = {
-                "base_pages": [],
-                "tail_pages": [],
-                "num_base_records": pr.num_base_records,
-                "num_tail_records": pr.num_tail_records
-            }
-            for column_pages in pr.base_pages:
-                serialized = [persist_page(page) for page in column_pages]
-                pr_data["base_pages"].append(serialized)
-            for column_pages in pr.tail_pages:
-                serialized = [persist_page(page) for page in column_pages]
-                pr_data["tail_pages"].append(serialized)
-            persisted_page_ranges.append(pr_data)
-        # Convert page_directory keys to strings
-        persisted_page_directory = { str(k): v for k, v in self.page_directory.items() }
-        persist_dict = {
-            "page_ranges": persisted_page_ranges,
-            "page_directory": persisted_page_directory
-        }
+            # Fixed positional layout [num_records, data], the page bytearray is packed as one bin blob without an extra copy
+            return (page.num_records, page.data)
         with open(data_file, "wb") as file:
-            file.write(msgpack.packb(persist_dict, use_bin_type=True))
+            # Stream the top-level map one page range at a time instead of building it all in memory
+            file.write(packer.pack_map_header(2))
+            file.write(packer.pack("page_ranges"))
+            file.write(packer.pack_array_header(len(self.page_range)))
+            for pr in self.page_range:
+                pr_data = {
+                    "base_pages": [[persist_page(page) for page in column_pages] for column_pages in pr.base_pages],
+                    "tail_pages": [[persist_page(page) for page in column_pages] for column_pages in pr.tail_pages],
+                    "num_base_records": pr.num_base_records,
+                    "num_tail_records": pr.num_tail_records
+                }
+                file.write(packer.pack(pr_data))
+            # The directory is written as its packed location array, one bin blob
+            file.write(packer.pack("page_directory"))
+            file.write(packer.pack(self.page_directory.serialize()))
     
     def load_records(self, db_path):
         """
@@ -120,61 +137,82 @@ class Table:
         """
         data_file = db_path + f"_{self.name}.msgpack"
         try:
-            with open(data_file, "rb") as file:
-                persist_dict = msgpack.unpackb(file.read(), raw=False, strict_map_key=False)
             def load_page(page_data):
-                from lstore.page import Page
                 page = Page()  # create a new empty page
-                page.num_records = page_data["num_records"]
-                page.data = bytearray(page_data["data"])
+                if isinstance(page_data, dict):  # Older files keyed every page field by name
+                    page_data = (page_data["num_records"], page_data["data"])
+                page.num_records = page_data[0]
+                page.data = bytearray(page_data[1])  # Accepts both bin blobs and older lists of ints
                 return page
-            loaded_page_ranges = []
-            for pr_data in persist_dict.get("page_ranges", []):
-                from lstore.page_range import PageRange
+            def load_page_range(pr_data):
                 pr = PageRange(self.num_columns)
                 # Rebuild base pages
-                pr.base_pages = []
-                for col_data in pr_data.get("base_pages", []):
-                    pages = [load_page(page_data) for page_data in col_data]
-                    pr.base_pages.append(pages)
+                pr.base_pages = [[load_page(page_data) for page_data in col_data] for col_data in pr_data.get("base_pages", [])]
                 # Rebuild tail pages
-                pr.tail_pages = []
-                for col_data in pr_data.get("tail_pages", []):
-                    pages = [load_page(page_data) for page_data in col_data]
-                    pr.tail_pages.append(pages)
+                pr.tail_pages = [[load_page(page_data) for page_data in col_data] for col_data in pr_data.get("tail_pages", [])]
                 pr.num_base_records = pr_data.get("num_base_records", 0)
                 pr.num_tail_records = pr_data.get("num_tail_records", 0)
-                loaded_page_ranges.append(pr)
+                return pr
+            loaded_page_ranges = []
+            persisted_page_directory = None
+            with open(data_file, "rb") as file:
+                # Stream the top-level map back one page range at a time instead of reading the whole file first
+                unpacker = msgpack.Unpacker(file, raw=False, strict_map_key=False, max_buffer_size=0, read_size=65536)
+                try:
+                    num_fields = unpacker.read_map_header()
+                except (ValueError, msgpack.OutOfData):  # Dropped tables are overwritten with an empty list
+                    num_fields = 0
+                for _ in range(num_fields):
+                    field = unpacker.unpack()
+                    if field == "page_ranges":
+                        # Size the list from the array header and fill it by index
+                        loaded_page_ranges = [None] * unpacker.read_array_header()
+                        for pr_index in range(len(loaded_page_ranges)):
+                            loaded_page_ranges[pr_index] = load_page_range(unpacker.unpack())
+                    elif field == "page_directory":
+                        persisted_page_directory = unpacker.unpack()
+                    else:
+                        unpacker.skip()
             if loaded_page_ranges:
                 self.page_range = loaded_page_ranges
-            # Rebuild page_directory and index by scanning all base records.
-            from lstore.config import METADATA_COLUMNS, RID_COLUMN
-            self.page_directory = {}
-            from lstore.index import Index
+                self.page_range_index = len(loaded_page_ranges) - 1  # Keep inserting into the last range
+            # Restore page_directory from its packed locations
+            legacy = not isinstance(persisted_page_directory, bytes)
+            self.page_directory = PageDirectory() if legacy else PageDirectory.deserialize(persisted_page_directory)
+            if isinstance(persisted_page_directory, dict):  # Older files keyed it by string RIDs, tail records included
+                for rid, location in persisted_page_directory.items():
+                    if location is None:
+                        self.page_directory.delete(int(rid))
+                    else:
+                        self.page_directory[int(rid)] = location
+            last_rid = len(self.page_directory.locations) - 1  # Highest RID the file refers to
+            # Rebuild the index by scanning the RID and indexed columns of all base pages.
             self.index = Index(self)
+            indexed_columns = [i for i, column in enumerate(self.index.indices) if column is not None]
             for pr_index, pr in enumerate(self.page_range):
                 # Base pages of every column should have the same page structure.
                 num_pages = len(pr.base_pages[0])
                 for page_index in range(num_pages):
-                    num_slots = pr.base_pages[0][page_index].num_records
-                    for slot in range(num_slots):
-                        record = pr.read_record(page_index, slot, [1] * self.num_columns, True)
-                        if record is None:
-                            continue
-                        rid = record[RID_COLUMN]
-                        self.page_directory[rid] = (pr_index, page_index, slot)
-                        self.index.insert(record)
+                    # Unpack only the needed column pages whole, deleted records have their RID zeroed
+                    rids = pr.base_pages[RID_COLUMN][page_index].read_all()
+                    if persisted_page_directory is None:  # No directory at all, locate the base records from their RID column
+                        for slot, rid in enumerate(rids):
+                            if rid:
+                                self.page_directory[rid] = (pr_index, page_index, slot)
+                    if legacy:  # Base records point at their newest tail, which may be the last RID an older file handed out
+                        last_rid = max(last_rid, *rids, *pr.base_pages[INDIRECTION_COLUMN][page_index].read_all())
+                    columns = {i: pr.base_pages[i + METADATA_COLUMNS][page_index].read_all() for i in indexed_columns}
+                    self.index.insert_columns(rids, columns)
+            self.rid = max(self.rid, last_rid + 1)  # Never hand out a persisted RID again
         except FileNotFoundError:
             pass
 
     def consolidate_index(self):
-        from lstore.config import METADATA_COLUMNS, RID_COLUMN
-        from lstore.index import Index
         self.index = Index(self)
         for rid, loc in self.page_directory.items():
             if loc is None:
                 continue
             pr_index, bp_index, slot = loc
-            record = self.page_range[pr_index].read_record(bp_index, slot, [1] * self.num_columns, True)
+            record = self.page_range[pr_index].read_record(bp_index, slot, self.full_mask, True)
             if record is not None:
                 self.index.insert(record)
\ No newline at end of file
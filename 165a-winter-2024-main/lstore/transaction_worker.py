@@ -36,9 +36,10 @@ class TransactionWorker:
 
 
     def __run(self):
+        append_stat = self.stats.append
         for transaction in self.transactions:
             # each transaction returns True if committed or False if aborted
-            self.stats.append(transaction.run())
+            append_stat(transaction.run())
         # stores the number of transactions that committed
-        self.result = len(list(filter(lambda x: x, self.stats)))
+        self.result = sum(map(bool, self.stats))
 